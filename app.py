@@ -4,52 +4,107 @@ import json
 import requests
 import os
 import html
-from sefp.data import fetch_stock_data, NIFTY50_SYMBOLS, fetch_market_context
-from sefp.indicators import (
-    add_ema, add_rsi, add_adx, add_vwap,
-    add_bollinger_bands, add_supertrend
+import re
+from types import MappingProxyType
+from sefp.data import (
+    fetch_stock_data, NIFTY50_SYMBOLS, NIFTY50_LABELS,
+    fetch_market_context, prefetch_all
 )
-from sefp.logic import analyze_sefp
+from sefp.indicators import add_all_indicators
+from sefp.logic import analyze_sefp, to_arrays
 from sefp.verdict import calculate_verdict
 from sefp.llm_interpreter import format_verdict_for_llm, create_user_friendly_interpretation
 
+# Display constants (built once, not on every rerun)
+ACTION_COLOR = MappingProxyType({
+    'BUY': '🟢',
+    'WAIT': '🟡',
+    'AVOID': '🔴'
+})
+DISCLAIMER = "⚠️ Educational use only. Not financial advice."
+FOOTER_DISCLAIMER = (
+    "⚠️ **Disclaimer:** This tool is for educational purposes only. Not financial advice. "
+    "Always do your own research before making investment decisions."
+)
+
+# Plain-language rewrites for verdict reasoning, applied in one regex pass
+_REASONING_REPLACEMENTS = {
+    "Weak conditions with score": "Overall signals are weak (score",
+    "Moderate conditions with score": "Signals are mixed (score",
+    "Strong buy signal with score": "Signals are strong (score",
+    "Key factors:": "Main reasons:",
+    "Trend valid": "Trend looks supportive",
+    "Volume confirmed": "Higher-than-usual trading activity",
+    "RSI in accumulation zone": "Momentum is steady and building",
+    "Price above VWAP": "Price is trading above its recent average",
+    "Strong trend strength, ADX > 25": "Trend momentum is strong",
+    "Recommendation: Consider entering position with proper risk management.": "Suggestion: You may consider an entry, with cautious risk control.",
+    "Recommendation: Monitor for improved conditions before entry.": "Suggestion: Wait and watch for clearer signals.",
+    "Recommendation: Avoid entry until conditions improve.": "Suggestion: Hold off for now until conditions improve.",
+}
+# Longest phrases first so overlapping prefixes resolve to the most specific match
+_REASONING_PATTERN = re.compile(
+    "|".join(re.escape(k) for k in sorted(_REASONING_REPLACEMENTS, key=len, reverse=True))
+)
+
+# Sentence boundaries in verdict reasoning (period followed by any whitespace)
+_SENTENCE_SPLIT = re.compile(r"\.\s+")
+
+
+def simplify_reasoning(text: str) -> str:
+    """Rewrite verdict reasoning phrases into plain language."""
+    return _REASONING_PATTERN.sub(lambda m: _REASONING_REPLACEMENTS[m.group(0)], text)
+
+
+@st.cache_resource(ttl=900, show_spinner="Loading NIFTY 50 data...")
+def warm_data_cache() -> None:
+    """Batch-download all NIFTY 50 symbols once per process (refreshed every 15 min)."""
+    prefetch_all()
+
+
 st.title("Alpha Lens")
+warm_data_cache()
 
 # Disclaimer
-st.warning("⚠️ Educational use only. Not financial advice.")
+st.warning(DISCLAIMER)
 
 # Stock selection
 st.subheader("Select Stock")
 selected_symbol = st.selectbox(
     "Choose a NIFTY 50 stock:",
     options=NIFTY50_SYMBOLS,
-    format_func=lambda x: x.replace(".NS", "").replace("_", " ")
+    format_func=NIFTY50_LABELS.__getitem__
 )
 
 # Analyze button
 if st.button("Analyze", type="primary"):
+    # Drop the previous result so a failed run doesn't leave stale output on screen
+    st.session_state.pop("last_context", None)
     with st.spinner("Fetching data and analyzing..."):
         try:
             # Fetch data
             df = fetch_stock_data(selected_symbol)
             
             # Add all indicators
-            df = add_ema(df)
-            df = add_rsi(df)
-            df = add_adx(df)
-            df = add_vwap(df)
-            df = add_bollinger_bands(df)
-            df = add_supertrend(df)
+            df = add_all_indicators(df)
             
             # Fetch market context
             market_context = fetch_market_context()
             
-            # Run SEFP logic
-            analysis = analyze_sefp(df)
+            # Run SEFP logic and verdict on column arrays extracted once
+            arrays = to_arrays(df)
+            analysis = analyze_sefp(arrays)
             
             # Calculate verdict
-            verdict = calculate_verdict(analysis, df)
-            # Store context for chat
+            verdict = calculate_verdict(analysis, arrays)
+            
+            # Create user-friendly interpretation request
+            # (LLM request is generated but not displayed in the UI)
+            user_friendly_request = create_user_friendly_interpretation(
+                selected_symbol, analysis, verdict, df, market_context
+            )
+            
+            # Store context for display and chat
             st.session_state["last_context"] = {
                 "symbol": selected_symbol,
                 "analysis": analysis,
@@ -58,75 +113,7 @@ if st.button("Analyze", type="primary"):
                 "llm_data": format_verdict_for_llm(selected_symbol, analysis, verdict, df),
             }
             
-            # Display results
             st.success("Analysis Complete!")
-            
-            # Score and Action
-            col1, col2 = st.columns(2)
-            with col1:
-                st.metric("Score", f"{verdict['score']}/100")
-            with col2:
-                action_color = {
-                    'BUY': '🟢',
-                    'WAIT': '🟡',
-                    'AVOID': '🔴'
-                }
-                st.metric("Action", f"{action_color.get(verdict['action'], '')} {verdict['action']}")
-            
-            # User-Friendly Interpretation
-            st.subheader("Investor-Friendly Summary")
-            
-            
-            # Create user-friendly interpretation request
-            user_friendly_request = create_user_friendly_interpretation(
-                selected_symbol, analysis, verdict, df, market_context
-            )
-            
-            # Display market context if available
-            if market_context and 'nifty_trend' in market_context:
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("NIFTY Trend", market_context.get('nifty_trend', 'Unknown'))
-                with col2:
-                    change = market_context.get('nifty_change_pct', 0)
-                    if change:
-                        st.metric("NIFTY Change", f"{change:+.2f}%")
-                    else:
-                        st.metric("NIFTY Change", "N/A")
-                with col3:
-                    st.metric("Market Sentiment", market_context.get('market_sentiment', 'Neutral'))
-            
-            # LLM request is generated but not displayed in the UI
-            
-            # Plain-language reasoning
-            st.subheader("Plain-Language Summary")
-
-            def simplify_reasoning(text: str) -> str:
-                replacements = {
-                    "Weak conditions with score": "Overall signals are weak (score",
-                    "Moderate conditions with score": "Signals are mixed (score",
-                    "Strong buy signal with score": "Signals are strong (score",
-                    "Key factors:": "Main reasons:",
-                    "Trend valid": "Trend looks supportive",
-                    "Volume confirmed": "Higher-than-usual trading activity",
-                    "RSI in accumulation zone": "Momentum is steady and building",
-                    "Price above VWAP": "Price is trading above its recent average",
-                    "Strong trend strength, ADX > 25": "Trend momentum is strong",
-                    "Recommendation: Consider entering position with proper risk management.": "Suggestion: You may consider an entry, with cautious risk control.",
-                    "Recommendation: Monitor for improved conditions before entry.": "Suggestion: Wait and watch for clearer signals.",
-                    "Recommendation: Avoid entry until conditions improve.": "Suggestion: Hold off for now until conditions improve.",
-                }
-                for old, new in replacements.items():
-                    if old in text:
-                        text = text.replace(old, new)
-                return text
-
-            reasoning_lines = verdict["reasoning"].split(". ")
-            for line in reasoning_lines:
-                if line.strip():
-                    st.write(f"• {simplify_reasoning(line.strip())}")
-            
-            # Analysis details and LLM data are intentionally hidden from the UI
         
         except ValueError as e:
             st.error(f"Data Error: {str(e)}")
@@ -138,7 +125,52 @@ if st.button("Analyze", type="primary"):
             st.error(f"An unexpected error occurred: {str(e)}")
             st.exception(e)
 
+
+def render_analysis(ctx: dict) -> None:
+    """Display the stored analysis from session state."""
+    verdict = ctx["verdict"]
+    market_context = ctx["market_context"]
+    
+    st.caption(f"Showing analysis for {NIFTY50_LABELS.get(ctx['symbol'], ctx['symbol'])}")
+    
+    # Score and Action
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Score", f"{verdict['score']}/100")
+    with col2:
+        st.metric("Action", f"{ACTION_COLOR.get(verdict['action'], '')} {verdict['action']}")
+    
+    # User-Friendly Interpretation
+    st.subheader("Investor-Friendly Summary")
+    
+    # Display market context if available
+    if market_context and 'nifty_trend' in market_context:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("NIFTY Trend", market_context.get('nifty_trend', 'Unknown'))
+        with col2:
+            change = market_context.get('nifty_change_pct', 0)
+            if change:
+                st.metric("NIFTY Change", f"{change:+.2f}%")
+            else:
+                st.metric("NIFTY Change", "N/A")
+        with col3:
+            st.metric("Market Sentiment", market_context.get('market_sentiment', 'Neutral'))
+    
+    # Plain-language reasoning
+    st.subheader("Plain-Language Summary")
+    
+    for segment in filter(None, map(str.strip, _SENTENCE_SPLIT.split(verdict["reasoning"]))):
+        st.write(f"• {simplify_reasoning(segment)}")
+    
+    # Analysis details and LLM data are intentionally hidden from the UI
+
+
+# Render the latest analysis from session state, so unrelated reruns don't recompute it
+if "last_context" in st.session_state:
+    render_analysis(st.session_state["last_context"])
+
 # Footer disclaimer
 st.markdown("---")
-st.caption("⚠️ **Disclaimer:** This tool is for educational purposes only. Not financial advice. Always do your own research before making investment decisions.")
+st.caption(FOOTER_DISCLAIMER)
 
@@ -1,13 +1,44 @@
-from typing import Any, Dict, List, Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
 
+import hashlib
 import os
-import requests
 import time
+import httpx
+import orjson
+from cachetools import TTLCache
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
+from tenacity import retry, retry_if_result, stop_after_attempt, wait_exponential
 
 
-app = FastAPI(title="Alpha Lens Chat Backend")
+# Shared async client: keeps TLS connections to Google/OpenAI alive across requests
+client = httpx.AsyncClient(
+    timeout=30,
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await client.aclose()
+
+
+app = FastAPI(title="Alpha Lens Chat Backend", lifespan=lifespan)
+
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+# Verified tokeninfo payloads keyed by SHA-256 of the token, so follow-up chat
+# messages in the same session skip the Google round-trip.
+_token_cache: TTLCache = TTLCache(maxsize=1024, ttl=300)
+
+# Per-user token buckets, keyed by the verified Google identity: a burst of
+# CHAT_BURST messages, then one message every 1 / CHAT_REFILL_PER_SEC seconds.
+CHAT_BURST = 5.0
+CHAT_REFILL_PER_SEC = 0.2
+_chat_buckets: TTLCache = TTLCache(maxsize=4096, ttl=600)
 
 
 class ChatRequest(BaseModel):
@@ -20,13 +51,54 @@ class ChatResponse(BaseModel):
     content: str
 
 
-def verify_google_token(id_token: str) -> Dict[str, Any]:
+@retry(
+    retry=retry_if_result(lambda resp: resp.status_code in RETRY_STATUS_CODES),
+    stop=stop_after_attempt(4),
+    wait=wait_exponential(multiplier=2),
+    retry_error_callback=lambda state: state.outcome.result(),
+)
+async def send_with_retry(method: str, url: str, stream: bool = False, **kwargs: Any) -> httpx.Response:
+    # Retries rate-limited/transient failures with exponential backoff (2s, 4s, 8s);
+    # the last response is returned once attempts are exhausted.
+    resp = await client.send(client.build_request(method, url, **kwargs), stream=stream)
+    if stream and resp.status_code >= 400:
+        # Error bodies are small; read them so the connection is released
+        await resp.aread()
+    return resp
+
+
+def token_key(id_token: str) -> str:
+    return hashlib.sha256(id_token.encode()).hexdigest()
+
+
+def chat_identity(token_data: Dict[str, Any], id_token: str) -> str:
+    # Stable per-user key from a *verified* tokeninfo payload, so rotating
+    # tokens doesn't reset the user's bucket
+    return token_data.get("sub") or token_data.get("email") or token_key(id_token)
+
+
+def take_chat_token(identity: str) -> None:
+    now = time.monotonic()
+    count, last = _chat_buckets.get(identity, (CHAT_BURST, now))
+    count = min(CHAT_BURST, count + (now - last) * CHAT_REFILL_PER_SEC)
+    if count < 1:
+        _chat_buckets[identity] = (count, now)
+        raise HTTPException(status_code=429, detail="Too many messages. Please wait a few seconds.")
+    _chat_buckets[identity] = (count - 1, now)
+
+
+async def verify_google_token(id_token: str) -> Dict[str, Any]:
+    cache_key = token_key(id_token)
+    cached = _token_cache.get(cache_key)
+    if cached is not None and float(cached.get("exp", "inf")) > time.time():
+        return cached
+
     # Try ID token validation first
     tokeninfo_url = "https://oauth2.googleapis.com/tokeninfo"
-    resp = requests.get(tokeninfo_url, params={"id_token": id_token}, timeout=10)
+    resp = await send_with_retry("GET", tokeninfo_url, params={"id_token": id_token}, timeout=10)
     if resp.status_code != 200:
         # Fallback: try as access token
-        resp = requests.get(tokeninfo_url, params={"access_token": id_token}, timeout=10)
+        resp = await send_with_retry("GET", tokeninfo_url, params={"access_token": id_token}, timeout=10)
     if resp.status_code != 200:
         raise HTTPException(status_code=401, detail="Invalid Google token")
 
@@ -34,39 +106,75 @@ def verify_google_token(id_token: str) -> Dict[str, Any]:
     expected_aud = os.getenv("GOOGLE_CLIENT_ID")
     if expected_aud and data.get("aud") and data.get("aud") != expected_aud:
         raise HTTPException(status_code=401, detail="Token audience mismatch")
+    _token_cache[cache_key] = data
     return data
 
 
-def call_openai(messages: List[Dict[str, Any]], model: str) -> str:
+OPENAI_URL = "https://api.openai.com/v1/chat/completions"
+
+
+async def send_openai(messages: List[Dict[str, Any]], model: str, stream: bool = False) -> httpx.Response:
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise HTTPException(status_code=500, detail="Missing OPENAI_API_KEY")
 
-    url = "https://api.openai.com/v1/chat/completions"
     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
     payload = {
         "model": model,
         "messages": messages,
         "temperature": 0.3,
         "max_tokens": 300,
+        "stream": stream,
     }
-    retries = 3
-    backoff = 2
-    for attempt in range(retries + 1):
-        resp = requests.post(url, headers=headers, json=payload, timeout=30)
-        if resp.status_code == 429 and attempt < retries:
-            time.sleep(backoff)
-            backoff *= 2
-            continue
-        if resp.status_code >= 400:
-            raise HTTPException(status_code=resp.status_code, detail=resp.text)
-        data = resp.json()
-        return data["choices"][0]["message"]["content"]
-    raise HTTPException(status_code=429, detail="Rate limit reached. Please retry.")
+    resp = await send_with_retry("POST", OPENAI_URL, stream=stream, headers=headers, json=payload)
+    if resp.status_code == 429:
+        raise HTTPException(status_code=429, detail="Rate limit reached. Please retry.")
+    if resp.status_code >= 400:
+        raise HTTPException(status_code=resp.status_code, detail=resp.text)
+    return resp
+
+
+async def call_openai(messages: List[Dict[str, Any]], model: str) -> str:
+    resp = await send_openai(messages, model)
+    data = resp.json()
+    return data["choices"][0]["message"]["content"]
+
+
+async def stream_openai_events(resp: httpx.Response) -> AsyncIterator[str]:
+    # Re-emit OpenAI's SSE stream as `data: {"content": ...}` events ending with [DONE]
+    try:
+        async for line in resp.aiter_lines():
+            if not line.startswith("data: "):
+                continue
+            data = line[len("data: "):]
+            if data == "[DONE]":
+                break
+            choices = orjson.loads(data).get("choices") or [{}]
+            delta = choices[0].get("delta", {}).get("content")
+            if delta:
+                yield f"data: {orjson.dumps({'content': delta}).decode()}\n\n"
+        yield "data: [DONE]\n\n"
+    finally:
+        await resp.aclose()
 
 
 @app.post("/chat", response_model=ChatResponse)
-def chat(req: ChatRequest) -> ChatResponse:
-    verify_google_token(req.id_token)
-    content = call_openai(req.messages, req.model)
+async def chat(req: ChatRequest) -> ChatResponse:
+    # Verify before calling OpenAI so unauthenticated requests never reach the paid API
+    token_data = await verify_google_token(req.id_token)
+    take_chat_token(chat_identity(token_data, req.id_token))
+    content = await call_openai(req.messages, req.model)
     return ChatResponse(content=content)
+
+
+@app.post("/chat/stream")
+async def chat_stream(req: ChatRequest) -> StreamingResponse:
+    # Auth must pass before the stream opens: the status code is sent with the first byte
+    token_data = await verify_google_token(req.id_token)
+    take_chat_token(chat_identity(token_data, req.id_token))
+    resp = await send_openai(req.messages, req.model, stream=True)
+    return StreamingResponse(
+        stream_openai_events(resp),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},  # don't let nginx buffer events
+    )
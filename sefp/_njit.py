@@ -0,0 +1,13 @@
+# Numba shim: use numba.njit when installed, otherwise run kernels as plain Python
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports bare and parameterized use)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        
+        def decorator(func):
+            return func
+        
+        return decorator
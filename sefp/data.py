@@ -1,8 +1,13 @@
 # Data module
 import yfinance as yf
 import pandas as pd
-from datetime import datetime, timedelta
-from typing import Dict, Any
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Tuple
+
+try:
+    import streamlit as st
+except ImportError:  # keep the data layer usable outside Streamlit (backend, scripts)
+    st = None
 
 # NIFTY 50 stock symbols (Indian stock market)
 NIFTY50_SYMBOLS = [
@@ -18,27 +23,94 @@ NIFTY50_SYMBOLS = [
     "BPCL.NS", "MARICO.NS", "INDUSINDBK.NS", "ADANIPOWER.NS", "GODREJCP.NS"
 ]
 
+# Display labels for the symbol dropdown (e.g. "M&M.NS" -> "M&M")
+NIFTY50_LABELS = {s: s.replace(".NS", "").replace("_", " ") for s in NIFTY50_SYMBOLS}
+
+# Column dtypes returned by fetch_stock_data()
+OHLCV_DTYPES = {
+    "Open": "float32",
+    "High": "float32",
+    "Low": "float32",
+    "Close": "float32",
+    "Volume": "float32",
+}
+
+# Per-symbol OHLCV frames filled by prefetch_all()
+_CACHE: Dict[str, pd.DataFrame] = {}
+
+
+def _cache_data(**kwargs):
+    """Memoize with st.cache_data when Streamlit is available, otherwise no-op."""
+    if st is None:
+        return lambda func: func
+    return st.cache_data(**kwargs)
+
+
+def _date_range() -> Tuple[date, date]:
+    """Return (start, end) covering at least 1 year of daily bars."""
+    # Day granularity; end is exclusive, so include today's bar
+    end_date = datetime.now().date() + timedelta(days=1)
+    start_date = end_date - timedelta(days=400)  # Fetch extra days to account for weekends/holidays
+    return start_date, end_date
+
+
+def prefetch_all() -> None:
+    """
+    Download OHLCV data for all NIFTY 50 symbols in a single batched request
+    and store it in the module-level cache used by fetch_stock_data().
+    
+    Failures are swallowed: fetch_stock_data() falls back to per-symbol requests.
+    """
+    start_date, end_date = _date_range()
+    try:
+        data = yf.download(
+            tickers=" ".join(NIFTY50_SYMBOLS),
+            start=start_date,
+            end=end_date,
+            group_by="ticker",
+            auto_adjust=True,
+            threads=True,
+            progress=False,
+        )
+    except Exception:
+        return
+    
+    if data.empty:
+        return
+    
+    _CACHE.clear()
+    for symbol in NIFTY50_SYMBOLS:
+        if symbol in data.columns.get_level_values(0):
+            frame = data[symbol].dropna(how="all")
+            # A ticker that failed inside the batch comes back all-NaN; leave it
+            # uncached so fetch_stock_data() falls back to a per-symbol request
+            if not frame.empty:
+                _CACHE[symbol] = frame
+
 
+@_cache_data(ttl=900, max_entries=64, show_spinner=False)
 def fetch_stock_data(symbol: str) -> pd.DataFrame:
     """
     Fetch daily OHLCV (Open, High, Low, Close, Volume) data for a stock symbol.
+    Results are cached for 15 minutes when running under Streamlit.
     
     Args:
         symbol: Stock symbol (e.g., "RELIANCE.NS" for Indian stocks)
     
     Returns:
-        pandas DataFrame with OHLCV data
+        pandas DataFrame with float32 OHLCV columns
     
     Raises:
         ValueError: If the fetched data has fewer than 150 rows
     """
-    # Calculate date range: at least 1 year of data
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=400)  # Fetch extra days to account for weekends/holidays
-    
-    # Fetch data using yfinance
-    ticker = yf.Ticker(symbol)
-    df = ticker.history(start=start_date, end=end_date)
+    # Use the batched prefetch if available, else fetch this symbol alone
+    df = _CACHE.get(symbol)
+    if df is not None:
+        df = df.copy()
+    else:
+        start_date, end_date = _date_range()
+        ticker = yf.Ticker(symbol)
+        df = ticker.history(start=start_date, end=end_date)
     
     # Check if data was fetched successfully
     if df.empty:
@@ -52,9 +124,11 @@ def fetch_stock_data(symbol: str) -> pd.DataFrame:
             f"This may indicate insufficient trading history or data availability issues."
         )
     
-    return df
+    # Keep only OHLCV as float32: halves the bytes every indicator pass reads
+    return df[list(OHLCV_DTYPES)].astype(OHLCV_DTYPES)
 
 
+@_cache_data(ttl=60, show_spinner=False)
 def fetch_market_context() -> Dict[str, Any]:
     """
     Fetch global market context (NIFTY 50 index) for correlation analysis.
@@ -74,10 +148,11 @@ def fetch_market_context() -> Dict[str, Any]:
                 'market_sentiment': 'Neutral'
             }
         
-        latest = nifty_df.iloc[-1]
-        previous = nifty_df.iloc[-2] if len(nifty_df) > 1 else latest
+        closes = nifty_df['Close'].to_numpy()
+        latest_close = float(closes[-1])
+        previous_close = float(closes[-2]) if len(closes) > 1 else latest_close
         
-        nifty_change = ((latest['Close'] - previous['Close']) / previous['Close']) * 100
+        nifty_change = ((latest_close - previous_close) / previous_close) * 100
         
         # Determine trend
         if nifty_change > 0.5:
@@ -93,7 +168,7 @@ def fetch_market_context() -> Dict[str, Any]:
         return {
             'nifty_trend': nifty_trend,
             'nifty_change_pct': round(nifty_change, 2),
-            'nifty_level': round(float(latest['Close']), 2),
+            'nifty_level': round(latest_close, 2),
             'market_sentiment': market_sentiment
         }
     except Exception as e:
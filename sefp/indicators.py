@@ -1,7 +1,292 @@
 # Indicators module
+from functools import partial
+from typing import Dict, Optional
+
 import pandas as pd
 import numpy as np
 
+from sefp._njit import njit
+
+# Indicator outputs are stored as float32, like the OHLCV inputs; kernels still
+# compute in float64. VWAP keeps float64 (long cumulative sums).
+INDICATOR_DTYPE = np.float32
+
+# Columns the indicators read; add_all_indicators() extracts them once as float64
+INPUT_COLUMNS = ('High', 'Low', 'Close', 'Volume')
+
+
+@njit(cache=True, nogil=True)
+def _rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over `window` values; NaN until the window is full and NaN-free."""
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    total = 0.0
+    nan_count = 0
+    for i in range(n):
+        if np.isnan(x[i]):
+            nan_count += 1
+        else:
+            total += x[i]
+        if i >= window:
+            if np.isnan(x[i - window]):
+                nan_count -= 1
+            else:
+                total -= x[i - window]
+        if i >= window - 1 and nan_count == 0:
+            out[i] = total / window
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _ewm_mean(x: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Recursive exponentially weighted mean, y[i] = (1 - alpha) * y[i-1] + alpha * x[i].
+    Matches pandas ewm(alpha=alpha, adjust=False).mean(), including NaN handling.
+    """
+    n = x.shape[0]
+    out = np.empty(n)
+    weighted = np.nan
+    old_wt = 1.0
+    for i in range(n):
+        cur = x[i]
+        is_obs = not np.isnan(cur)
+        if not np.isnan(weighted):
+            old_wt *= 1.0 - alpha
+            if is_obs:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                old_wt = 1.0
+        elif is_obs:
+            weighted = cur
+        out[i] = weighted
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _adx_loop(tr: np.ndarray, plus_dm: np.ndarray, minus_dm: np.ndarray, n: int) -> np.ndarray:
+    """Compute ADX from True Range and directional movement arrays (Wilder smoothing)."""
+    alpha = 1.0 / n
+    atr = _ewm_mean(tr, alpha)
+    plus_di = 100.0 * _ewm_mean(plus_dm, alpha) / atr
+    minus_di = 100.0 * _ewm_mean(minus_dm, alpha) / atr
+    dx = 100.0 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    return _ewm_mean(dx, alpha)
+
+
+@njit(cache=True, nogil=True)
+def supertrend_loop(close: np.ndarray, upper_band_base: np.ndarray, lower_band_base: np.ndarray):
+    """
+    Run the SuperTrend band/direction state machine; returns (supertrend, direction).
+    Shared with the Polars port (sefp.indicators_polars).
+    """
+    n = close.shape[0]
+    supertrend = np.empty(n)
+    if n == 0:
+        return supertrend, np.empty(0)
+    
+    upper_band = upper_band_base[0]
+    lower_band = lower_band_base[0]
+    supertrend[0] = upper_band
+    
+    # Only the previous bar's bands are carried, as scalars
+    for i in range(1, n):
+        prev = supertrend[i-1]
+        prev_upper = upper_band
+        prev_lower = lower_band
+        
+        # Update upper band
+        if upper_band_base[i] < prev or close[i-1] > prev:
+            upper_band = upper_band_base[i]
+        else:
+            upper_band = prev
+        
+        # Update lower band
+        if lower_band_base[i] > prev or close[i-1] < prev:
+            lower_band = lower_band_base[i]
+        else:
+            lower_band = prev
+        
+        # Determine SuperTrend value
+        if prev == prev_upper and close[i] <= upper_band:
+            supertrend[i] = upper_band
+        elif prev == prev_upper and close[i] > upper_band:
+            supertrend[i] = lower_band
+        elif prev == prev_lower and close[i] >= lower_band:
+            supertrend[i] = lower_band
+        elif prev == prev_lower and close[i] < lower_band:
+            supertrend[i] = upper_band
+        else:
+            supertrend[i] = prev
+    
+    # Set direction: 1 for uptrend, -1 for downtrend (the first bar is always -1)
+    direction = np.where(close > supertrend, 1.0, -1.0)
+    direction[0] = -1.0
+    
+    return supertrend, direction
+
+
+def _true_range(data) -> np.ndarray:
+    """
+    Compute True Range as a float64 array from a DataFrame or a dict of
+    column arrays.
+    
+    TR = max(High - Low, |High - previous Close|, |Low - previous Close|); the
+    first bar has no previous Close, so its TR is High - Low.
+    """
+    high = np.asarray(data['High'], dtype=np.float64)
+    low = np.asarray(data['Low'], dtype=np.float64)
+    prev_close = np.roll(np.asarray(data['Close'], dtype=np.float64), 1)
+    if prev_close.shape[0]:
+        prev_close[0] = np.nan
+    # Reduce pairwise into one buffer (no stacked 3 x n temporary);
+    # fmax skips the NaN previous Close on the first bar
+    tr = high - low
+    np.fmax(tr, np.abs(high - prev_close), out=tr)
+    np.fmax(tr, np.abs(low - prev_close), out=tr)
+    return tr
+
+
+def _rolling_mean_std(x: np.ndarray, window: int):
+    """
+    Rolling mean and sample standard deviation (ddof=1) over a fixed window,
+    in O(n) from cumulative sums of x and x**2.
+    
+    The first window - 1 values, and any window containing a NaN, are NaN
+    (same as pandas rolling(window).mean()/.std()).
+    """
+    n = x.shape[0]
+    mean = np.full(n, np.nan)
+    std = np.full(n, np.nan)
+    if n < window:
+        return mean, std
+    
+    missing = np.isnan(x)
+    # Shift by a representative value so the x**2 sums don't cancel catastrophically
+    offset = x[~missing][0] if not missing.all() else 0.0
+    values = np.where(missing, 0.0, x - offset)
+    
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    csum_sq = np.concatenate(([0.0], np.cumsum(values * values)))
+    cnan = np.concatenate(([0], np.cumsum(missing)))
+    
+    window_sum = csum[window:] - csum[:-window]
+    window_sum_sq = csum_sq[window:] - csum_sq[:-window]
+    complete = (cnan[window:] - cnan[:-window]) == 0
+    
+    window_mean = window_sum / window
+    variance = (window_sum_sq - window_sum * window_mean) / (window - 1)
+    np.maximum(variance, 0.0, out=variance)  # rounding can leave tiny negatives
+    
+    mean[window - 1:] = np.where(complete, window_mean + offset, np.nan)
+    std[window - 1:] = np.where(complete, np.sqrt(variance), np.nan)
+    return mean, std
+
+
+def _skipna_cumsum(x: np.ndarray) -> np.ndarray:
+    """Cumulative sum that skips NaN but keeps it in place (Series.cumsum())."""
+    missing = np.isnan(x)
+    total = np.cumsum(np.where(missing, 0.0, x))
+    total[missing] = np.nan
+    return total
+
+
+# Column builders: each reads only 'High'/'Low'/'Close'/'Volume' from a DataFrame
+# or a dict of float64 arrays, and returns {column name: ndarray} without
+# touching the frame. add_* assign them; add_all_indicators shares one input set.
+def _ema_columns(data, period: int = 20) -> Dict[str, np.ndarray]:
+    # Recursive EMA (same as ewm(span=period, adjust=False)) in the compiled kernel
+    close = np.asarray(data['Close'], dtype=np.float64)
+    return {f'EMA_{period}': _ewm_mean(close, 2 / (period + 1)).astype(INDICATOR_DTYPE)}
+
+
+def _rsi_columns(data, period: int = 14) -> Dict[str, np.ndarray]:
+    close = np.asarray(data['Close'], dtype=np.float64)
+    delta = np.diff(close, prepend=np.nan)
+    
+    # The first bar has no change; NaN compares False, so it counts as 0
+    gain = _rolling_mean(np.where(delta > 0, delta, 0.0), period)
+    loss = _rolling_mean(np.where(delta < 0, -delta, 0.0), period)
+    
+    # loss == 0 gives inf/NaN like the Series division did, without the warnings
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = gain / loss
+        rsi = 100 - (100 / (1 + rs))
+    return {f'RSI_{period}': rsi.astype(INDICATOR_DTYPE)}
+
+
+def _adx_columns(data, period: int = 14, tr: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    # Calculate True Range (TR) unless shared by the caller
+    if tr is None:
+        tr = _true_range(data)
+    
+    # Calculate Directional Movement (first bar has no previous bar, so NaN)
+    plus_dm = np.diff(np.asarray(data['High'], dtype=np.float64), prepend=np.nan)
+    minus_dm = -np.diff(np.asarray(data['Low'], dtype=np.float64), prepend=np.nan)
+    
+    plus_dm[plus_dm < 0] = 0
+    minus_dm[minus_dm < 0] = 0
+    
+    # Smooth TR and DM with Wilder's recursion, then compute ADX (compiled kernel)
+    return {f'ADX_{period}': _adx_loop(tr, plus_dm, minus_dm, period).astype(INDICATOR_DTYPE)}
+
+
+def _vwap_columns(data) -> Dict[str, np.ndarray]:
+    # Calculate typical price
+    high = np.asarray(data['High'], dtype=np.float64)
+    low = np.asarray(data['Low'], dtype=np.float64)
+    close = np.asarray(data['Close'], dtype=np.float64)
+    typical_price = (high + low + close) / 3
+    
+    # Calculate VWAP (cumulative, in float64 so long running sums keep precision)
+    volume = np.asarray(data['Volume'], dtype=np.float64)
+    return {'VWAP': _skipna_cumsum(typical_price * volume) / _skipna_cumsum(volume)}
+
+
+def _bollinger_columns(data, period: int = 20, std_dev: float = 2.0) -> Dict[str, np.ndarray]:
+    # Calculate middle band (SMA) and standard deviation in one cumsum pass
+    middle, std = _rolling_mean_std(np.asarray(data['Close'], dtype=np.float64), period)
+    
+    # Calculate upper and lower bands
+    return {
+        'BB_Middle': middle.astype(INDICATOR_DTYPE),
+        'BB_Upper': (middle + (std * std_dev)).astype(INDICATOR_DTYPE),
+        'BB_Lower': (middle - (std * std_dev)).astype(INDICATOR_DTYPE)
+    }
+
+
+def _supertrend_columns(
+    data,
+    period: int = 10,
+    multiplier: float = 3.0,
+    tr: Optional[np.ndarray] = None
+) -> Dict[str, np.ndarray]:
+    # Calculate ATR (Average True Range)
+    if tr is None:
+        tr = _true_range(data)
+    atr = _rolling_mean(tr, period)
+    
+    # Calculate basic bands on raw arrays
+    high = np.asarray(data['High'], dtype=np.float64)
+    low = np.asarray(data['Low'], dtype=np.float64)
+    close = np.asarray(data['Close'], dtype=np.float64)
+    hl_avg = (high + low) / 2
+    upper_band_base = hl_avg + (multiplier * atr)
+    lower_band_base = hl_avg - (multiplier * atr)
+    
+    # Run the band/direction state machine (compiled kernel)
+    supertrend, direction = supertrend_loop(close, upper_band_base, lower_band_base)
+    
+    return {
+        'SuperTrend': supertrend.astype(INDICATOR_DTYPE),
+        'SuperTrend_Direction': direction.astype(INDICATOR_DTYPE)
+    }
+
+
+def _assign(df: pd.DataFrame, columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    for col, values in columns.items():
+        df[col] = values
+    return df
+
 
 def add_ema(df: pd.DataFrame, period: int = 20) -> pd.DataFrame:
     """
@@ -12,11 +297,9 @@ def add_ema(df: pd.DataFrame, period: int = 20) -> pd.DataFrame:
         period: Period for EMA calculation (default: 20)
     
     Returns:
-        DataFrame with 'EMA_{period}' column added
+        The same DataFrame with 'EMA_{period}' column added (modified in place)
     """
-    df = df.copy()
-    df[f'EMA_{period}'] = df['Close'].ewm(span=period, adjust=False).mean()
-    return df
+    return _assign(df, _ema_columns(df, period))
 
 
 def add_rsi(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
@@ -28,57 +311,24 @@ def add_rsi(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
         period: Period for RSI calculation (default: 14)
     
     Returns:
-        DataFrame with 'RSI_{period}' column added
+        The same DataFrame with 'RSI_{period}' column added (modified in place)
     """
-    df = df.copy()
-    delta = df['Close'].diff()
-    
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    
-    rs = gain / loss
-    df[f'RSI_{period}'] = 100 - (100 / (1 + rs))
-    
-    return df
+    return _assign(df, _rsi_columns(df, period))
 
 
-def add_adx(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+def add_adx(df: pd.DataFrame, period: int = 14, tr: Optional[np.ndarray] = None) -> pd.DataFrame:
     """
     Add Average Directional Index (ADX) indicator to DataFrame.
     
     Args:
         df: DataFrame with 'High', 'Low', 'Close' columns
         period: Period for ADX calculation (default: 14)
+        tr: Optional precomputed True Range array (from _true_range)
     
     Returns:
-        DataFrame with 'ADX_{period}' column added
+        The same DataFrame with 'ADX_{period}' column added (modified in place)
     """
-    df = df.copy()
-    
-    # Calculate True Range (TR)
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift())
-    low_close = np.abs(df['Low'] - df['Close'].shift())
-    
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    
-    # Calculate Directional Movement
-    plus_dm = df['High'].diff()
-    minus_dm = -df['Low'].diff()
-    
-    plus_dm[plus_dm < 0] = 0
-    minus_dm[minus_dm < 0] = 0
-    
-    # Calculate smoothed TR and DM
-    atr = tr.rolling(window=period).mean()
-    plus_di = 100 * (plus_dm.rolling(window=period).mean() / atr)
-    minus_di = 100 * (minus_dm.rolling(window=period).mean() / atr)
-    
-    # Calculate ADX
-    dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
-    df[f'ADX_{period}'] = dx.rolling(window=period).mean()
-    
-    return df
+    return _assign(df, _adx_columns(df, period, tr))
 
 
 def add_vwap(df: pd.DataFrame) -> pd.DataFrame:
@@ -90,17 +340,9 @@ def add_vwap(df: pd.DataFrame) -> pd.DataFrame:
         df: DataFrame with 'High', 'Low', 'Close', 'Volume' columns
     
     Returns:
-        DataFrame with 'VWAP' column added
+        The same DataFrame with 'VWAP' column added (modified in place)
     """
-    df = df.copy()
-    
-    # Calculate typical price
-    typical_price = (df['High'] + df['Low'] + df['Close']) / 3
-    
-    # Calculate VWAP (cumulative)
-    df['VWAP'] = (typical_price * df['Volume']).cumsum() / df['Volume'].cumsum()
-    
-    return df
+    return _assign(df, _vwap_columns(df))
 
 
 def add_bollinger_bands(df: pd.DataFrame, period: int = 20, std_dev: float = 2.0) -> pd.DataFrame:
@@ -113,24 +355,17 @@ def add_bollinger_bands(df: pd.DataFrame, period: int = 20, std_dev: float = 2.0
         std_dev: Number of standard deviations (default: 2.0)
     
     Returns:
-        DataFrame with 'BB_Upper', 'BB_Middle', 'BB_Lower' columns added
+        The same DataFrame with 'BB_Upper', 'BB_Middle', 'BB_Lower' columns added (modified in place)
     """
-    df = df.copy()
-    
-    # Calculate middle band (SMA)
-    df['BB_Middle'] = df['Close'].rolling(window=period).mean()
-    
-    # Calculate standard deviation
-    std = df['Close'].rolling(window=period).std()
-    
-    # Calculate upper and lower bands
-    df['BB_Upper'] = df['BB_Middle'] + (std * std_dev)
-    df['BB_Lower'] = df['BB_Middle'] - (std * std_dev)
-    
-    return df
+    return _assign(df, _bollinger_columns(df, period, std_dev))
 
 
-def add_supertrend(df: pd.DataFrame, period: int = 10, multiplier: float = 3.0) -> pd.DataFrame:
+def add_supertrend(
+    df: pd.DataFrame,
+    period: int = 10,
+    multiplier: float = 3.0,
+    tr: Optional[np.ndarray] = None
+) -> pd.DataFrame:
     """
     Add SuperTrend indicator to DataFrame.
     
@@ -138,69 +373,39 @@ def add_supertrend(df: pd.DataFrame, period: int = 10, multiplier: float = 3.0)
         df: DataFrame with 'High', 'Low', 'Close' columns
         period: Period for ATR calculation (default: 10)
         multiplier: Multiplier for ATR (default: 3.0)
+        tr: Optional precomputed True Range array (from _true_range)
     
     Returns:
-        DataFrame with 'SuperTrend', 'SuperTrend_Direction' columns added
+        The same DataFrame with 'SuperTrend', 'SuperTrend_Direction' columns added (modified in place)
+    """
+    return _assign(df, _supertrend_columns(df, period, multiplier, tr))
+
+
+def add_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """
-    df = df.copy()
+    Add all SEFP indicators (EMA, RSI, ADX, VWAP, Bollinger Bands, SuperTrend)
+    to DataFrame.
     
-    # Calculate ATR (Average True Range)
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift())
-    low_close = np.abs(df['Low'] - df['Close'].shift())
+    The input columns are read once into float64 arrays shared by every
+    indicator; each indicator returns its output arrays and they are assigned
+    to df once, overwriting any existing indicator columns.
     
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    atr = tr.rolling(window=period).mean()
+    Args:
+        df: DataFrame with 'High', 'Low', 'Close', 'Volume' columns
     
-    # Calculate basic bands
-    hl_avg = (df['High'] + df['Low']) / 2
-    upper_band_base = hl_avg + (multiplier * atr)
-    lower_band_base = hl_avg - (multiplier * atr)
+    Returns:
+        The same DataFrame with all indicator columns added (modified in place)
+    """
+    inputs = {col: df[col].to_numpy(dtype=np.float64) for col in INPUT_COLUMNS if col in df.columns}
     
-    # Initialize arrays for SuperTrend calculation
-    supertrend = np.zeros(len(df))
-    direction = np.zeros(len(df))
-    upper_band = np.zeros(len(df))
-    lower_band = np.zeros(len(df))
-    
-    for i in range(len(df)):
-        if i == 0:
-            upper_band[i] = upper_band_base.iloc[i]
-            lower_band[i] = lower_band_base.iloc[i]
-            supertrend[i] = upper_band[i]
-            direction[i] = -1
-        else:
-            # Update upper band
-            if upper_band_base.iloc[i] < supertrend[i-1] or df['Close'].iloc[i-1] > supertrend[i-1]:
-                upper_band[i] = upper_band_base.iloc[i]
-            else:
-                upper_band[i] = supertrend[i-1]
-            
-            # Update lower band
-            if lower_band_base.iloc[i] > supertrend[i-1] or df['Close'].iloc[i-1] < supertrend[i-1]:
-                lower_band[i] = lower_band_base.iloc[i]
-            else:
-                lower_band[i] = supertrend[i-1]
-            
-            # Determine SuperTrend value and direction
-            if supertrend[i-1] == upper_band[i-1] and df['Close'].iloc[i] <= upper_band[i]:
-                supertrend[i] = upper_band[i]
-            elif supertrend[i-1] == upper_band[i-1] and df['Close'].iloc[i] > upper_band[i]:
-                supertrend[i] = lower_band[i]
-            elif supertrend[i-1] == lower_band[i-1] and df['Close'].iloc[i] >= lower_band[i]:
-                supertrend[i] = lower_band[i]
-            elif supertrend[i-1] == lower_band[i-1] and df['Close'].iloc[i] < lower_band[i]:
-                supertrend[i] = upper_band[i]
-            else:
-                supertrend[i] = supertrend[i-1]
-            
-            # Set direction: 1 for uptrend, -1 for downtrend
-            if df['Close'].iloc[i] > supertrend[i]:
-                direction[i] = 1
-            else:
-                direction[i] = -1
+    # True Range is shared by ADX and SuperTrend, so compute it once
+    tr = _true_range(inputs)
+    pipeline = (
+        _ema_columns, _rsi_columns, partial(_adx_columns, tr=tr), _vwap_columns,
+        _bollinger_columns, partial(_supertrend_columns, tr=tr)
+    )
     
-    df['SuperTrend'] = supertrend
-    df['SuperTrend_Direction'] = direction
+    for indicator in pipeline:
+        _assign(df, indicator(inputs))
     
     return df
@@ -0,0 +1,200 @@
+# Indicators module (Polars)
+# Same indicators as sefp/indicators.py, expressed as one lazy Polars query so
+# shared inputs (True Range, rolling windows on Close) are planned together and
+# independent columns are evaluated in parallel.
+# Optional: needs polars, which is not in requirements.txt (pip install polars).
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from sefp.indicators import supertrend_loop
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Output columns, in the same order as sefp.indicators.add_all_indicators()
+INDICATOR_COLUMNS = [
+    'EMA_20', 'RSI_14', 'ADX_14', 'VWAP',
+    'BB_Middle', 'BB_Upper', 'BB_Lower',
+    'SuperTrend', 'SuperTrend_Direction'
+]
+
+# Computed in float64, stored like sefp.indicators (VWAP keeps float64)
+FLOAT32_COLUMNS = [col for col in INDICATOR_COLUMNS if col != 'VWAP']
+
+
+def _true_range_expr() -> pl.Expr:
+    """True Range; max_horizontal skips the null previous Close on the first bar."""
+    prev_close = pl.col('Close').shift(1)
+    return pl.max_horizontal(
+        pl.col('High') - pl.col('Low'),
+        (pl.col('High') - prev_close).abs(),
+        (pl.col('Low') - prev_close).abs()
+    )
+
+
+def ema_expr(period: int = 20) -> pl.Expr:
+    """EMA of Close ('EMA_{period}')."""
+    return pl.col('Close').ewm_mean(span=period, adjust=False).alias(f'EMA_{period}')
+
+
+def rsi_expr(period: int = 14) -> pl.Expr:
+    """RSI of Close with simple rolling-mean gains/losses ('RSI_{period}')."""
+    delta = pl.col('Close').diff()
+    gain = pl.when(delta > 0).then(delta).otherwise(0.0).rolling_mean(period)
+    loss = pl.when(delta < 0).then(-delta).otherwise(0.0).rolling_mean(period)
+    return (100 - (100 / (1 + gain / loss))).alias(f'RSI_{period}')
+
+
+def _wilder_smooth(expr: pl.Expr, period: int) -> pl.Expr:
+    # NaN (e.g. 0/0 in DX) is treated as missing, as pandas ewm does
+    return expr.fill_nan(None).ewm_mean(alpha=1 / period, adjust=False).forward_fill()
+
+
+def adx_expr(period: int = 14) -> pl.Expr:
+    """ADX with Wilder smoothing ('ADX_{period}'); expects the '_TR' helper column."""
+    plus_dm = pl.col('High').diff().clip(lower_bound=0)
+    minus_dm = (-pl.col('Low').diff()).clip(lower_bound=0)
+    atr = _wilder_smooth(pl.col('_TR'), period)
+    plus_di = 100 * _wilder_smooth(plus_dm, period) / atr
+    minus_di = 100 * _wilder_smooth(minus_dm, period) / atr
+    dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di)
+    return _wilder_smooth(dx, period).alias(f'ADX_{period}')
+
+
+def vwap_expr() -> pl.Expr:
+    """Cumulative VWAP ('VWAP')."""
+    typical_price = (pl.col('High') + pl.col('Low') + pl.col('Close')) / 3
+    return ((typical_price * pl.col('Volume')).cum_sum() / pl.col('Volume').cum_sum()).alias('VWAP')
+
+
+def bollinger_exprs(period: int = 20, std_dev: float = 2.0) -> list:
+    """Bollinger Bands ('BB_Middle', 'BB_Upper', 'BB_Lower')."""
+    middle = pl.col('Close').rolling_mean(period)
+    std = pl.col('Close').rolling_std(period)
+    return [
+        middle.alias('BB_Middle'),
+        (middle + std * std_dev).alias('BB_Upper'),
+        (middle - std * std_dev).alias('BB_Lower')
+    ]
+
+
+def _supertrend_batch(bands: pl.Series) -> pl.Series:
+    """Run the compiled SuperTrend kernel over a struct of (Close, upper, lower) bands."""
+    fields = bands.struct.unnest()
+    supertrend, direction = supertrend_loop(
+        fields['Close'].to_numpy().astype(np.float64),
+        fields['upper'].to_numpy().astype(np.float64),
+        fields['lower'].to_numpy().astype(np.float64)
+    )
+    return pl.DataFrame({
+        'SuperTrend': supertrend,
+        'SuperTrend_Direction': direction
+    }).to_struct(bands.name)
+
+
+def supertrend_expr(period: int = 10, multiplier: float = 3.0) -> pl.Expr:
+    """
+    SuperTrend as a '_SuperTrend' struct column (unnested by the caller);
+    expects the '_TR' helper column. The recursion runs in the numba kernel.
+    """
+    atr = pl.col('_TR').rolling_mean(period)
+    hl_avg = (pl.col('High') + pl.col('Low')) / 2
+    bands = pl.struct(
+        pl.col('Close'),
+        (hl_avg + multiplier * atr).alias('upper'),
+        (hl_avg - multiplier * atr).alias('lower')
+    )
+    return bands.map_batches(
+        _supertrend_batch,
+        return_dtype=pl.Struct({'SuperTrend': pl.Float64, 'SuperTrend_Direction': pl.Float64})
+    ).alias('_SuperTrend')
+
+
+def add_all_indicators(df: pl.DataFrame, by: Optional[str] = None) -> pl.DataFrame:
+    """
+    Add all SEFP indicators to a Polars DataFrame in a single lazy query.
+    
+    Args:
+        df: Polars DataFrame with 'High', 'Low', 'Close', 'Volume' columns
+        by: Optional key column (e.g. 'symbol'); indicators are then computed
+            independently per key with window expressions, rows kept in order
+    
+    Returns:
+        Polars DataFrame with INDICATOR_COLUMNS added (float32, VWAP float64)
+    """
+    def per_key(expr: pl.Expr) -> pl.Expr:
+        return expr.over(by) if by is not None else expr
+    
+    present = [col for col in OHLCV_COLUMNS if col in df.columns]
+    indicators = [
+        ema_expr(),
+        rsi_expr(),
+        adx_expr(),
+        vwap_expr(),
+        *bollinger_exprs(),
+        supertrend_expr()
+    ]
+    return (
+        df.lazy()
+        .with_columns(pl.col(present).cast(pl.Float64))
+        .with_columns(per_key(_true_range_expr()).alias('_TR'))
+        .with_columns([per_key(expr) for expr in indicators])
+        .unnest('_SuperTrend')
+        .drop('_TR')
+        .with_columns(pl.col(FLOAT32_COLUMNS).cast(pl.Float32))
+        .collect()
+    )
+
+
+def _naive_index(index: pd.Index) -> pd.Index:
+    """
+    Drop the timezone from a DatetimeIndex, keeping local (exchange) dates:
+    Ticker.history() returns tz-aware bars, the batched download naive ones.
+    """
+    if getattr(index, 'tz', None) is not None:
+        return index.tz_localize(None)
+    return index
+
+
+def add_all_indicators_batch(frames: Dict[str, pd.DataFrame]) -> pl.DataFrame:
+    """
+    Compute indicators for many symbols in one query instead of one pipeline run
+    per symbol; Polars evaluates the per-symbol windows in parallel.
+    
+    Args:
+        frames: Mapping of symbol -> pandas OHLCV DataFrame (e.g. from fetch_stock_data)
+    
+    Returns:
+        Long Polars DataFrame with 'symbol', 'Date' (tz-naive Datetime), OHLCV and
+        INDICATOR_COLUMNS, rows grouped by symbol in the order given
+    """
+    long_df = pl.concat([
+        pl.DataFrame({
+            'symbol': [symbol] * len(df),
+            'Date': pl.Series('Date', _naive_index(df.index)),
+            **{col: df[col].to_numpy() for col in OHLCV_COLUMNS if col in df.columns}
+        })
+        for symbol, df in frames.items()
+    ], how='vertical_relaxed')
+    return add_all_indicators(long_df, by='symbol')
+
+
+def add_all_indicators_pandas(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pandas entry point for add_all_indicators(): converts to Polars once,
+    runs the query, and writes the indicator columns back.
+    
+    Args:
+        df: pandas DataFrame with 'High', 'Low', 'Close', 'Volume' columns
+    
+    Returns:
+        The same DataFrame with INDICATOR_COLUMNS added (modified in place)
+    """
+    result = add_all_indicators(
+        pl.DataFrame({col: df[col].to_numpy() for col in OHLCV_COLUMNS if col in df.columns})
+    )
+    for col in INDICATOR_COLUMNS:
+        df[col] = result[col].to_numpy()
+    return df
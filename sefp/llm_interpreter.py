@@ -5,6 +5,20 @@ import json
 from typing import Dict, Any, Optional
 
 
+def _make_json_serializable(obj):
+    """
+    json.dumps() default hook: convert numpy/pandas scalars to native Python types.
+    Only called for objects the encoder can't handle itself; NaN becomes null.
+    """
+    if isinstance(obj, np.generic):
+        if isinstance(obj, np.floating) and np.isnan(obj):
+            return None
+        return obj.item()
+    if obj is pd.NA or obj is pd.NaT:
+        return None
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
 def format_verdict_for_llm(
     stock_symbol: str,
     analysis: Dict[str, Any],
@@ -29,34 +43,41 @@ def format_verdict_for_llm(
             'insufficient_data': True
         }
     
-    latest = df.iloc[-1]
+    # Latest values as scalars, read once per column
+    latest = {
+        col: df[col].to_numpy()[-1]
+        for col in ('SuperTrend_Direction', 'Close', 'VWAP', 'RSI_14', 'ADX_14', 'Volume')
+        if col in df.columns
+    }
     
-    # Determine market regime based on SuperTrend (convert to native Python bool/int)
+    # Read each field once; missing columns behave like NaN
     supertrend_dir = latest.get('SuperTrend_Direction', 0)
-    if pd.notna(supertrend_dir):
-        supertrend_dir = int(supertrend_dir)
+    close_raw = latest.get('Close')
+    vwap_raw = latest.get('VWAP')
+    rsi = latest.get('RSI_14')
+    adx = latest.get('ADX_14')
+    
+    # Determine market regime based on SuperTrend (NaN is neither 1 nor -1, so Bear)
     market_regime = "Bull" if supertrend_dir == 1 else "Bear"
     
     # Determine price vs VWAP (convert to native Python types)
-    close_price = float(latest.get('Close', 0)) if pd.notna(latest.get('Close', 0)) else 0
-    vwap_price = float(latest.get('VWAP', 0)) if pd.notna(latest.get('VWAP', 0)) else 0
+    close_price = float(close_raw) if pd.notna(close_raw) else 0
+    vwap_price = float(vwap_raw) if pd.notna(vwap_raw) else 0
     price_vs_vwap = "above" if close_price > vwap_price else "below"
     
-    # Get RSI and ADX values
-    rsi = latest.get('RSI_14', None)
-    adx = latest.get('ADX_14', None)
-    
     # Format RSI and ADX (handle NaN and convert to native Python float)
     rsi_value = round(float(rsi), 1) if pd.notna(rsi) else None
     adx_value = round(float(adx), 1) if pd.notna(adx) else None
     
-    # Determine Wyckoff phase based on momentum and RSI
+    # Determine Wyckoff phase based on momentum and RSI (no RSI: Accumulation)
     momentum = analysis.get('momentum', 'neutral')
-    if momentum == 'bullish' and rsi_value and 45 <= rsi_value <= 60:
+    if not rsi_value:
+        wyckoff_phase = "Accumulation"
+    elif momentum == 'bullish' and 45 <= rsi_value <= 60:
         wyckoff_phase = "Markup"
-    elif momentum == 'exhausted' and rsi_value and rsi_value > 70:
+    elif momentum == 'exhausted' and rsi_value > 70:
         wyckoff_phase = "Distribution"
-    elif momentum == 'exhausted' and rsi_value and rsi_value < 30:
+    elif momentum == 'exhausted' and rsi_value < 30:
         wyckoff_phase = "Markdown"
     else:
         wyckoff_phase = "Accumulation"
@@ -65,7 +86,7 @@ def format_verdict_for_llm(
     volume_confirmed = analysis.get('volume_confirmed', False)
     if volume_confirmed and len(df) >= 20:
         latest_volume = latest.get('Volume', 0)
-        avg_volume = df['Volume'].tail(20).mean()
+        avg_volume = np.nanmean(df['Volume'].to_numpy()[-20:])
         if avg_volume > 0:
             deviation = ((latest_volume - avg_volume) / avg_volume) * 100
             delivery_deviation = f"{deviation:+.0f}%"
@@ -79,10 +100,10 @@ def format_verdict_for_llm(
         'stock': stock_symbol.replace('.NS', ''),
         'market_regime': market_regime,
         'trend_valid': bool(analysis.get('trend_valid', False)),
-        'adx': float(adx_value) if adx_value is not None else None,
-        'rsi': float(rsi_value) if rsi_value is not None else None,
+        'adx': adx_value,
+        'rsi': rsi_value,
         'price_vs_vwap': price_vs_vwap,
-        'volume_confirmed': bool(analysis.get('volume_confirmed', False)),
+        'volume_confirmed': bool(volume_confirmed),
         'wyckoff_phase': wyckoff_phase,
         'delivery_deviation': delivery_deviation,
         'score': int(verdict.get('score', 0)),
@@ -122,23 +143,8 @@ Trend Assessment:
 Action:
 Risk Note:"""
     
-    # Convert to JSON-serializable types (handle numpy/pandas types)
-    def make_json_serializable(obj):
-        """Convert numpy/pandas types to native Python types"""
-        if isinstance(obj, (bool, np.bool_)):
-            return bool(obj)
-        elif isinstance(obj, (int, np.integer)):
-            return int(obj)
-        elif isinstance(obj, (float, np.floating)):
-            return float(obj) if not pd.isna(obj) else None
-        elif pd.isna(obj):
-            return None
-        else:
-            return obj
-    
-    json_safe_data = {k: make_json_serializable(v) for k, v in verdict_data.items()}
-    
-    user_prompt = f"Interpret the following stock analysis:\n```json\n{json.dumps(json_safe_data, indent=2)}\n```"
+    # numpy/pandas types are converted by the encoder hook
+    user_prompt = f"Interpret the following stock analysis:\n```json\n{json.dumps(verdict_data, indent=2, default=_make_json_serializable)}\n```"
     
     request_payload = {
         "model": model,
@@ -182,12 +188,12 @@ def create_user_friendly_interpretation(
         Dictionary with user-friendly interpretation request
     """
     verdict_data = format_verdict_for_llm(stock_symbol, analysis, verdict, df)
-    latest = df.iloc[-1]
+    latest_close = df['Close'].to_numpy()[-1] if 'Close' in df.columns else None
     
     # Build context summary
     context_summary = {
         'stock_name': stock_symbol.replace('.NS', ''),
-        'current_price': f"₹{float(latest['Close']):.2f}" if pd.notna(latest.get('Close')) else "N/A",
+        'current_price': f"₹{float(latest_close):.2f}" if pd.notna(latest_close) else "N/A",
         'score': verdict_data['score'],
         'recommendation': verdict_data['action'],
         'trend_status': 'Uptrend' if verdict_data['trend_valid'] else 'Downtrend or Weak Trend',
@@ -241,7 +247,7 @@ Key Findings:
 {market_info}
 
 Technical Details:
-{json.dumps(verdict_data, indent=2)}
+{json.dumps(verdict_data, indent=2, default=_make_json_serializable)}
 
 Please explain:
 1. What does this analysis tell us about {context_summary['stock_name']}?
@@ -249,22 +255,6 @@ Please explain:
 3. How do global market conditions (if provided) relate to this stock?
 4. What should an investor watch for?"""
     
-    # Convert to JSON-serializable types
-    def make_json_serializable(obj):
-        """Convert numpy/pandas types to native Python types"""
-        if isinstance(obj, (bool, np.bool_)):
-            return bool(obj)
-        elif isinstance(obj, (int, np.integer)):
-            return int(obj)
-        elif isinstance(obj, (float, np.floating)):
-            return float(obj) if not pd.isna(obj) else None
-        elif pd.isna(obj):
-            return None
-        else:
-            return obj
-    
-    json_safe_data = {k: make_json_serializable(v) for k, v in verdict_data.items()}
-    
     request_payload = {
         "model": model,
         "messages": [
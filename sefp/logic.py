@@ -1,9 +1,32 @@
 # Logic module
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Mapping, Optional, Union
 
 
-def analyze_sefp(df: pd.DataFrame) -> Dict[str, Any]:
+# Indicator columns analyze_sefp() needs (in message order), and as a set for lookups
+REQUIRED_COLUMNS = ('SuperTrend', 'SuperTrend_Direction', 'ADX_14', 'VWAP', 'Close', 'RSI_14', 'Volume')
+_REQUIRED = frozenset(REQUIRED_COLUMNS)
+
+
+def to_arrays(df: pd.DataFrame, cols: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    Extract DataFrame columns as NumPy arrays (no copy), so the scoring stages
+    can read values without going through pandas indexing.
+    
+    Args:
+        df: DataFrame with OHLCV/indicator columns
+        cols: Columns to extract (default: all); names not in df are skipped
+    
+    Returns:
+        Dictionary mapping column name -> 1-D array
+    """
+    if cols is None:
+        cols = df.columns
+    return {col: df[col].to_numpy(copy=False) for col in cols if col in df.columns}
+
+
+def analyze_sefp(df: Union[pd.DataFrame, Mapping[str, np.ndarray]]) -> Dict[str, Any]:
     """
     Analyze stock data using simplified SEFP Phase 3 logic.
     
@@ -14,7 +37,8 @@ def analyze_sefp(df: pd.DataFrame) -> Dict[str, Any]:
     - Volume confirmed if latest volume > 1.5 × 20-day average
     
     Args:
-        df: DataFrame with required indicator columns:
+        df: DataFrame, or dict of column arrays from to_arrays(), with required
+            indicator columns:
             - SuperTrend
             - SuperTrend_Direction
             - ADX_14
@@ -30,7 +54,8 @@ def analyze_sefp(df: pd.DataFrame) -> Dict[str, Any]:
         - volume_confirmed (bool): Whether volume is confirmed
         - notes (list): List of short descriptive strings
     """
-    if df.empty:
+    arrays = to_arrays(df) if isinstance(df, pd.DataFrame) else df
+    if not arrays or len(next(iter(arrays.values()))) == 0:
         return {
             'trend_valid': False,
             'momentum': 'neutral',
@@ -38,14 +63,12 @@ def analyze_sefp(df: pd.DataFrame) -> Dict[str, Any]:
             'notes': ['No data available']
         }
     
-    # Get the latest row (most recent data)
-    latest = df.iloc[-1]
     notes = []
     
     # Check required columns exist
-    required_cols = ['SuperTrend', 'SuperTrend_Direction', 'ADX_14', 'VWAP', 'Close', 'RSI_14', 'Volume']
-    missing_cols = [col for col in required_cols if col not in df.columns]
-    if missing_cols:
+    missing = _REQUIRED.difference(arrays)
+    if missing:
+        missing_cols = [col for col in REQUIRED_COLUMNS if col in missing]  # stable message order
         return {
             'trend_valid': False,
             'momentum': 'neutral',
@@ -53,6 +76,9 @@ def analyze_sefp(df: pd.DataFrame) -> Dict[str, Any]:
             'notes': [f'Missing required columns: {", ".join(missing_cols)}']
         }
     
+    # Get the latest values (most recent data) as scalars, read once per column
+    latest = {col: arrays[col][-1] for col in REQUIRED_COLUMNS}
+    
     # 1. Check trend validity
     # SuperTrend is green if SuperTrend_Direction == 1
     supertrend_green = latest['SuperTrend_Direction'] == 1
@@ -90,8 +116,9 @@ def analyze_sefp(df: pd.DataFrame) -> Dict[str, Any]:
     
     # 3. Check volume confirmation
     latest_volume = latest['Volume']
-    if len(df) >= 20:
-        avg_volume_20d = df['Volume'].tail(20).mean()
+    volume = arrays['Volume']
+    if len(volume) >= 20:
+        avg_volume_20d = np.nanmean(volume[-20:])
         volume_confirmed = latest_volume > (1.5 * avg_volume_20d)
         
         if volume_confirmed:
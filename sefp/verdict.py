@@ -1,9 +1,20 @@
 # Verdict module
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Mapping, Union
 
+from sefp.logic import to_arrays
 
-def calculate_verdict(analysis: Dict[str, Any], df: pd.DataFrame) -> Dict[str, Any]:
+
+# Indicator columns calculate_verdict() needs (in message order), and as a set for lookups
+REQUIRED_COLUMNS = ('ADX_14', 'VWAP', 'Close', 'RSI_14')
+_REQUIRED = frozenset(REQUIRED_COLUMNS)
+
+
+def calculate_verdict(
+    analysis: Dict[str, Any],
+    df: Union[pd.DataFrame, Mapping[str, np.ndarray]]
+) -> Dict[str, Any]:
     """
     Calculate SEFP Phase 5 scoring and verdict based on analysis results.
     
@@ -25,7 +36,8 @@ def calculate_verdict(analysis: Dict[str, Any], df: pd.DataFrame) -> Dict[str, A
             - momentum (str)
             - volume_confirmed (bool)
             - notes (list)
-        df: DataFrame with indicator columns (ADX_14, VWAP, Close, RSI_14)
+        df: DataFrame, or dict of column arrays from to_arrays(), with indicator
+            columns (ADX_14, VWAP, Close, RSI_14)
     
     Returns:
         Dictionary with:
@@ -33,28 +45,30 @@ def calculate_verdict(analysis: Dict[str, Any], df: pd.DataFrame) -> Dict[str, A
         - action (str): 'BUY', 'WAIT', or 'AVOID'
         - reasoning (str): 2-3 line explanation
     """
-    if df.empty:
+    arrays = to_arrays(df) if isinstance(df, pd.DataFrame) else df
+    if not arrays or len(next(iter(arrays.values()))) == 0:
         return {
             'score': 0,
             'action': 'AVOID',
             'reasoning': 'No data available for analysis. Cannot provide a verdict.'
         }
     
-    # Get latest values
-    latest = df.iloc[-1]
     score = 0
     score_details = []
     
     # Check required columns
-    required_cols = ['ADX_14', 'VWAP', 'Close', 'RSI_14']
-    missing_cols = [col for col in required_cols if col not in df.columns]
-    if missing_cols:
+    missing = _REQUIRED.difference(arrays)
+    if missing:
+        missing_cols = [col for col in REQUIRED_COLUMNS if col in missing]  # stable message order
         return {
             'score': 0,
             'action': 'AVOID',
             'reasoning': f'Missing required indicator data: {", ".join(missing_cols)}. Cannot calculate score.'
         }
     
+    # Get latest values as scalars, read once per column
+    latest = {col: arrays[col][-1] for col in REQUIRED_COLUMNS}
+    
     # 1. Trend valid → +30
     if analysis.get('trend_valid', False):
         score += 30
@@ -0,0 +1,56 @@
+"""
+Chat backend rate-limit test (no network: Google and OpenAI are mocked)
+"""
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import backend
+
+VALID_TOKENS = {"token-a": "user-1", "token-b": "user-1", "token-c": "user-2"}
+
+
+def mock_upstream(request: httpx.Request) -> httpx.Response:
+    if request.url.host == "oauth2.googleapis.com":
+        token = request.url.params.get("id_token") or request.url.params.get("access_token")
+        if token not in VALID_TOKENS:
+            return httpx.Response(400, json={"error": "invalid_token"})
+        return httpx.Response(200, json={"sub": VALID_TOKENS[token], "exp": "9999999999"})
+    return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(backend, "client", httpx.AsyncClient(transport=httpx.MockTransport(mock_upstream)))
+    backend._token_cache.clear()
+    backend._chat_buckets.clear()
+    with TestClient(backend.app) as test_client:
+        yield test_client
+
+
+def post_chat(client: TestClient, token: str) -> int:
+    return client.post("/chat", json={"id_token": token, "messages": []}).status_code
+
+
+def test_chat_rate_limit_burst_then_refill(client):
+    burst = int(backend.CHAT_BURST)
+
+    # The burst is shared by every token of the same verified user
+    codes = [post_chat(client, "token-a" if i % 2 else "token-b") for i in range(burst)]
+    assert codes == [200] * burst
+    assert post_chat(client, "token-a") == 429
+    assert post_chat(client, "token-b") == 429
+
+    # Other users have their own bucket
+    assert post_chat(client, "token-c") == 200
+
+    # Unverified tokens are rejected before they can take (or reset) a bucket
+    assert post_chat(client, "not-a-google-token") == 401
+    assert "not-a-google-token" not in backend._chat_buckets
+
+    # One refill interval later, exactly one more message is allowed
+    count, last = backend._chat_buckets["user-1"]
+    backend._chat_buckets["user-1"] = (count, last - 1 / backend.CHAT_REFILL_PER_SEC)
+    assert post_chat(client, "token-a") == 200
+    assert post_chat(client, "token-a") == 429
@@ -0,0 +1,102 @@
+"""
+Checks the compiled/NumPy indicator kernels against the pandas operations they
+replace, on data with NaN gaps (no network needed)
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from sefp.indicators import (
+    _ewm_mean, _rolling_mean, _rolling_mean_std, _true_range,
+    add_bollinger_bands, add_ema, add_rsi
+)
+
+
+def gappy_series(seed: int, rows: int = 400) -> np.ndarray:
+    """Random walk with leading NaNs, isolated NaNs and a long NaN run."""
+    rng = np.random.default_rng(seed)
+    x = 1000 + np.cumsum(rng.normal(0, 10, rows))
+    x[:3] = np.nan
+    x[[50, 51, 52, 120, 300]] = np.nan
+    x[200:230] = np.nan
+    return x
+
+
+def gappy_ohlcv(seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed + 100)
+    close = gappy_series(seed)
+    rows = len(close)
+    return pd.DataFrame({
+        'High': close + rng.uniform(0, 15, rows),
+        'Low': close - rng.uniform(0, 15, rows),
+        'Close': close + rng.normal(0, 3, rows),
+        'Volume': rng.integers(100_000, 5_000_000, rows).astype(float),
+    })
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("alpha", [2 / 21, 1 / 14])
+def test_ewm_mean_matches_pandas(seed, alpha):
+    x = gappy_series(seed)
+    expected = pd.Series(x).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    np.testing.assert_array_equal(_ewm_mean(x, alpha), expected)
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("window", [1, 10, 20])
+def test_rolling_mean_matches_pandas(seed, window):
+    x = gappy_series(seed)
+    expected = pd.Series(x).rolling(window).mean().to_numpy()
+    np.testing.assert_allclose(_rolling_mean(x, window), expected, rtol=1e-12, equal_nan=True)
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("window", [2, 20, 500])
+def test_rolling_mean_std_matches_pandas(seed, window):
+    x = gappy_series(seed)
+    mean, std = _rolling_mean_std(x, window)
+    rolling = pd.Series(x).rolling(window)
+    np.testing.assert_allclose(mean, rolling.mean().to_numpy(), rtol=1e-12, equal_nan=True)
+    # The cumsum form carries an absolute error ~eps * (running sum of squares),
+    # so compare std at the data's scale (prices ~1000) rather than relatively
+    np.testing.assert_allclose(std, rolling.std().to_numpy(), rtol=1e-7, atol=1e-6, equal_nan=True)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_true_range_matches_pandas(seed):
+    df = gappy_ohlcv(seed)
+    prev_close = df['Close'].shift()
+    expected = pd.concat([
+        df['High'] - df['Low'],
+        (df['High'] - prev_close).abs(),
+        (df['Low'] - prev_close).abs()
+    ], axis=1).max(axis=1)
+    np.testing.assert_array_equal(_true_range(df), expected.to_numpy())
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_ema_rsi_bollinger_match_pandas(seed):
+    df = gappy_ohlcv(seed)
+    close = df['Close']
+    
+    # Original pandas formulations, stored as float32 like the indicators
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    expected = {
+        'EMA_20': close.ewm(span=20, adjust=False).mean(),
+        'RSI_14': 100 - (100 / (1 + gain / loss)),
+        'BB_Middle': close.rolling(window=20).mean(),
+        'BB_Upper': close.rolling(window=20).mean() + 2.0 * close.rolling(window=20).std(),
+        'BB_Lower': close.rolling(window=20).mean() - 2.0 * close.rolling(window=20).std(),
+    }
+    
+    out = add_bollinger_bands(add_rsi(add_ema(df.copy())))
+    for col, values in expected.items():
+        np.testing.assert_allclose(
+            out[col].to_numpy(dtype=np.float64),
+            values.to_numpy(dtype=np.float32).astype(np.float64),
+            rtol=1e-6,
+            equal_nan=True,
+            err_msg=col,
+        )
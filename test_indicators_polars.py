@@ -0,0 +1,118 @@
+"""
+Keeps the Polars port (sefp.indicators_polars) in sync with sefp.indicators
+(skipped when the optional polars dependency isn't installed)
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+pl = pytest.importorskip("polars")
+
+from sefp.indicators import add_all_indicators, supertrend_loop
+from sefp.indicators_polars import (
+    INDICATOR_COLUMNS, _true_range_expr, add_all_indicators_pandas, supertrend_expr
+)
+
+
+def synthetic_ohlcv(seed: int, rows: int = 300) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 1000 + np.cumsum(rng.normal(0, 10, rows))
+    return pd.DataFrame({
+        'Open': close + rng.normal(0, 3, rows),
+        'High': close + rng.uniform(0, 15, rows),
+        'Low': close - rng.uniform(0, 15, rows),
+        'Close': close,
+        'Volume': rng.integers(100_000, 5_000_000, rows).astype(float),
+    }, index=pd.date_range('2024-01-01', periods=rows, freq='B')).astype('float32')
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_polars_port_matches_pandas(seed):
+    # Note: SuperTrend starts from a NaN ATR band here, so it is all NaN on both
+    # sides; test_supertrend_on_finite_bands covers the kernel and its wiring
+    df = synthetic_ohlcv(seed)
+    expected = add_all_indicators(df.copy())
+    actual = add_all_indicators_pandas(df.copy())
+    
+    for col in INDICATOR_COLUMNS:
+        np.testing.assert_allclose(
+            actual[col].to_numpy(dtype=np.float64),
+            expected[col].to_numpy(dtype=np.float64),
+            rtol=1e-5,
+            equal_nan=True,
+            err_msg=col,
+        )
+
+
+def reference_supertrend(close, upper_band_base, lower_band_base):
+    """The original (pre-numba) SuperTrend loop, kept as the reference."""
+    n = len(close)
+    supertrend = np.zeros(n)
+    direction = np.zeros(n)
+    upper_band = np.zeros(n)
+    lower_band = np.zeros(n)
+    
+    for i in range(n):
+        if i == 0:
+            upper_band[i] = upper_band_base[i]
+            lower_band[i] = lower_band_base[i]
+            supertrend[i] = upper_band[i]
+            direction[i] = -1
+        else:
+            if upper_band_base[i] < supertrend[i-1] or close[i-1] > supertrend[i-1]:
+                upper_band[i] = upper_band_base[i]
+            else:
+                upper_band[i] = supertrend[i-1]
+            
+            if lower_band_base[i] > supertrend[i-1] or close[i-1] < supertrend[i-1]:
+                lower_band[i] = lower_band_base[i]
+            else:
+                lower_band[i] = supertrend[i-1]
+            
+            if supertrend[i-1] == upper_band[i-1] and close[i] <= upper_band[i]:
+                supertrend[i] = upper_band[i]
+            elif supertrend[i-1] == upper_band[i-1] and close[i] > upper_band[i]:
+                supertrend[i] = lower_band[i]
+            elif supertrend[i-1] == lower_band[i-1] and close[i] >= lower_band[i]:
+                supertrend[i] = lower_band[i]
+            elif supertrend[i-1] == lower_band[i-1] and close[i] < lower_band[i]:
+                supertrend[i] = upper_band[i]
+            else:
+                supertrend[i] = supertrend[i-1]
+            
+            direction[i] = 1 if close[i] > supertrend[i] else -1
+    
+    return supertrend, direction
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_supertrend_on_finite_bands(seed, multiplier=3.0):
+    df = synthetic_ohlcv(seed).astype('float64')
+    high, low, close = (df[col].to_numpy() for col in ('High', 'Low', 'Close'))
+    
+    # period=1 makes ATR == True Range, so the bands are finite from bar 0
+    prev_close = np.r_[np.nan, close[:-1]]
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    hl_avg = (high + low) / 2
+    expected_st, expected_dir = reference_supertrend(
+        close, hl_avg + multiplier * tr, hl_avg - multiplier * tr
+    )
+    assert not np.isnan(expected_st).any()
+    assert set(np.unique(expected_dir)) == {-1.0, 1.0}
+    
+    # Compiled kernel
+    supertrend, direction = supertrend_loop(close, hl_avg + multiplier * tr, hl_avg - multiplier * tr)
+    np.testing.assert_array_equal(supertrend, expected_st)
+    np.testing.assert_array_equal(direction, expected_dir)
+    
+    # Polars expression (bands built in Polars, kernel run through map_batches)
+    result = (
+        pl.DataFrame({col: df[col].to_numpy() for col in ('High', 'Low', 'Close')})
+        .lazy()
+        .with_columns(_true_range_expr().alias('_TR'))
+        .with_columns(supertrend_expr(period=1, multiplier=multiplier))
+        .unnest('_SuperTrend')
+        .collect()
+    )
+    np.testing.assert_allclose(result['SuperTrend'].to_numpy(), expected_st, rtol=1e-12)
+    np.testing.assert_array_equal(result['SuperTrend_Direction'].to_numpy(), expected_dir)